@@ -0,0 +1,162 @@
+"""Tests for the background analysis record uploader."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tradingagents.agents.utils import analysis_recorder
+
+_BASE_URL = "http://analysis.test"
+_TRADING_DIR = Path(__file__).resolve().parents[1]
+
+
+class _StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+    
+    def raise_for_status(self):
+        pass
+
+
+class _StubClient:
+    """Stands in for the shared httpx.Client, recording every POST."""
+    
+    def __init__(self, batch_status):
+        self.batch_status = batch_status
+        self.posts = []
+        self.closed = False
+    
+    def post(self, url, content, headers):
+        self.posts.append((url, json.loads(content)))
+        if url.endswith("/batch"):
+            return _StubResponse(self.batch_status)
+        return _StubResponse(201)
+    
+    def close(self):
+        self.closed = True
+
+
+class _HangingClient(_StubClient):
+    """Stub client whose requests block until released, like an unresponsive API."""
+    
+    def __init__(self):
+        super().__init__(batch_status=200)
+        self.release = threading.Event()
+    
+    def post(self, url, content, headers):
+        self.release.wait()
+        return super().post(url, content, headers)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    monkeypatch.setenv("APP_ENV", "test")
+    monkeypatch.setenv("ANALYSIS_API_URL", _BASE_URL)
+    monkeypatch.setenv("ANALYSIS_API_BATCH_SIZE", "3")
+    monkeypatch.setattr(analysis_recorder, "_api_config", None)
+    monkeypatch.setattr(analysis_recorder, "_batch_endpoint_available", True)
+    # A generous window so the three records always land in one batch
+    monkeypatch.setattr(analysis_recorder, "_BATCH_WINDOW_SECONDS", 1.0)
+    return analysis_recorder
+
+
+def _queue_records(recorder, record_id):
+    state = {"trader_id": "trader-1", "record_id": record_id}
+    for role in ("risk_manager", "portfolio_manager", "trader_summary"):
+        recorder.record_agent_execution(state, role, f"{role} report")
+
+
+def test_batch_upload(recorder, monkeypatch):
+    client = _StubClient(batch_status=200)
+    monkeypatch.setattr(recorder, "_http_client", client)
+    
+    _queue_records(recorder, "round-1")
+    recorder._record_queue.join()
+    
+    assert len(client.posts) == 1
+    url, body = client.posts[0]
+    assert url == f"{_BASE_URL}/analysis-records/batch"
+    assert [r["role"] for r in body["records"]] == ["risk_manager", "portfolio_manager", "trader_summary"]
+
+
+def test_missing_batch_endpoint_falls_back_to_single_records(recorder, monkeypatch):
+    client = _StubClient(batch_status=404)
+    monkeypatch.setattr(recorder, "_http_client", client)
+    
+    _queue_records(recorder, "round-1")
+    recorder._record_queue.join()
+    
+    urls = [url for url, _ in client.posts]
+    assert urls == [f"{_BASE_URL}/analysis-records/batch"] + [f"{_BASE_URL}/analysis-records"] * 3
+    assert [body["role"] for _, body in client.posts[1:]] == ["risk_manager", "portfolio_manager", "trader_summary"]
+    assert all(body["recordId"] == "round-1" for _, body in client.posts[1:])
+    assert recorder._batch_endpoint_available is False
+    
+    # Later rounds skip the batch endpoint entirely
+    client.posts.clear()
+    _queue_records(recorder, "round-2")
+    recorder._record_queue.join()
+    
+    assert [url for url, _ in client.posts] == [f"{_BASE_URL}/analysis-records"] * 3
+
+
+def test_exit_flush_gives_up_on_hanging_api(recorder, monkeypatch):
+    client = _HangingClient()
+    monkeypatch.setattr(recorder, "_http_client", client)
+    monkeypatch.setattr(recorder, "_EXIT_FLUSH_TIMEOUT_SECONDS", 0.3)
+    
+    # The first batch hangs in the worker; the second stays queued
+    _queue_records(recorder, "round-1")
+    _queue_records(recorder, "round-2")
+    
+    started = time.monotonic()
+    recorder._flush_at_exit()
+    
+    assert time.monotonic() - started < 2
+    assert recorder._record_queue.empty()
+    assert client.closed
+    
+    # Only the in-flight batch completes once the API answers
+    client.release.set()
+    recorder._record_queue.join()
+    assert len(client.posts) == 1
+    assert all(r["recordId"] == "round-1" for r in client.posts[0][1]["records"])
+
+
+def test_pending_records_flushed_at_exit():
+    # The script exits without flushing; the atexit hook must upload the
+    # queued records before the stub client is closed
+    script = textwrap.dedent("""
+        import json
+        from tradingagents.agents.utils import analysis_recorder
+        
+        class Client:
+            posts = []
+            def post(self, url, content, headers):
+                self.posts.append(url)
+                return type("Response", (), {"status_code": 200, "raise_for_status": lambda self: None})()
+            def close(self):
+                print(json.dumps(self.posts))
+        
+        analysis_recorder._http_client = Client()
+        analysis_recorder.send_analysis_record("trader-1", "trader_summary", "summary", "round-1")
+    """)
+    env = {**os.environ, "APP_ENV": "test", "ANALYSIS_API_URL": _BASE_URL}
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=_TRADING_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True,
+    )
+    
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == [f"{_BASE_URL}/analysis-records"]
@@ -0,0 +1,107 @@
+"""Tests for the market data cache and the compiled indicator kernels."""
+
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils import futures_market_tools
+from tradingagents.agents.utils.futures_market_tools import _cached_market_data, calculate_atr, calculate_sma
+
+
+class _CountingClient:
+    """Stub exchange client that counts the requests it serves."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_klines(self, symbol, interval, limit):
+        self.calls += 1
+        return [{"close": float(limit)}]
+
+
+@pytest.fixture
+def market_cache(monkeypatch):
+    monkeypatch.setattr(futures_market_tools, "_MARKET_DATA_CACHE", futures_market_tools.OrderedDict())
+    monkeypatch.setattr(futures_market_tools, "_MARKET_DATA_CACHE_MAX_ENTRIES", 3)
+    return futures_market_tools._MARKET_DATA_CACHE
+
+
+def test_cached_market_data_reuses_live_entries(market_cache):
+    client = _CountingClient()
+    
+    first = _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 100)
+    assert _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 100) is first
+    assert client.calls == 1
+
+
+def test_cached_market_data_refetches_expired_entries(market_cache, monkeypatch):
+    client = _CountingClient()
+    monkeypatch.setitem(futures_market_tools._MARKET_DATA_TTL_SECONDS, "get_klines", -1)
+    
+    _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 100)
+    _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 100)
+    
+    assert client.calls == 2
+    assert len(market_cache) == 1
+
+
+def test_cached_market_data_evicts_least_recently_used(market_cache):
+    client = _CountingClient()
+    for limit in (10, 20, 30):
+        _cached_market_data(client, "get_klines", "BTCUSDT", "1h", limit)
+    # Touch the oldest entry so the next insert evicts limit=20 instead
+    _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 10)
+    _cached_market_data(client, "get_klines", "BTCUSDT", "1h", 40)
+    
+    assert [key[-1] for key in market_cache] == [30, 10, 40]
+    assert client.calls == 4
+
+
+@pytest.fixture(scope="module")
+def pd():
+    return pytest.importorskip("pandas")
+
+
+@pytest.fixture(scope="module")
+def ta():
+    return pytest.importorskip("pandas_ta")
+
+
+@pytest.fixture(scope="module")
+def klines():
+    """250 deterministic klines with gaps between closes and the next bar."""
+    rng = np.random.default_rng(20240501)
+    close = 70000 + np.cumsum(rng.normal(0, 120, 250))
+    open_ = np.roll(close, 1) + rng.normal(0, 40, 250)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) + rng.uniform(0, 90, 250)
+    low = np.minimum(open_, close) - rng.uniform(0, 90, 250)
+    return [
+        {"open": float(o), "high": float(h), "low": float(l), "close": float(c)}
+        for o, h, l, c in zip(open_, high, low, close)
+    ]
+
+
+@pytest.mark.parametrize("period", [5, 14, 50])
+@pytest.mark.parametrize("size", [15, 51, 250])
+def test_calculate_atr_matches_pandas_ta(pd, ta, klines, period, size):
+    window = klines[-size:]
+    if size < period + 1:
+        assert calculate_atr(window, period) == 0.0
+        return
+    
+    df = pd.DataFrame(window)
+    expected = ta.atr(high=df["high"], low=df["low"], close=df["close"], length=period).iloc[-1]
+    
+    assert calculate_atr(window, period) == pytest.approx(float(expected), rel=1e-9)
+
+
+@pytest.mark.parametrize("period", [5, 20, 50, 200])
+def test_calculate_sma_matches_pandas_ta(pd, ta, klines, period):
+    closes = [k["close"] for k in klines]
+    expected = ta.sma(pd.Series(closes), length=period).iloc[-1]
+    
+    assert calculate_sma(closes, period) == pytest.approx(float(expected), rel=1e-9)
+
+
+def test_calculate_sma_short_series():
+    assert calculate_sma([1.0, 2.0], 3) == 0.0
@@ -0,0 +1,93 @@
+"""Tests for the futures trader node helpers."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tradingagents.agents.trader import futures_trader
+from tradingagents.agents.trader.futures_trader import (
+    _astream_trader_response,
+    _is_flat_without_orders,
+    _parse_plan_decision,
+)
+
+_SUMMARY_TEXT = "### 💭 Trade Execution Summary\n\nHolding BTCUSDT with no changes."
+
+
+@pytest.mark.parametrize("plan", [
+    "Decision: HOLD",
+    "- Decision: [HOLD]",
+    "**Decision**: HOLD",
+    "**Decision:** HOLD",
+    "**Decision**: **HOLD**",
+])
+def test_parse_plan_decision_formats(plan):
+    assert _parse_plan_decision(f"## Plan\n{plan}\n- Leverage: 5x") == "HOLD"
+
+
+def test_parse_plan_decision_missing():
+    assert _parse_plan_decision("No decision line here") is None
+
+
+def _stream_response(monkeypatch, model):
+    deltas = []
+    monkeypatch.setattr(futures_trader, "get_stream_writer", lambda: deltas.append)
+    result = asyncio.run(_astream_trader_response(model, [HumanMessage(content="execute")]))
+    return result, deltas
+
+
+def test_astream_trader_response_streaming_model(monkeypatch):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=_SUMMARY_TEXT)]))
+    
+    result, deltas = _stream_response(monkeypatch, model)
+    
+    assert type(result) is AIMessage
+    assert result.content == _SUMMARY_TEXT
+    assert "".join(d["trader_summary_delta"] for d in deltas).strip() == "Holding BTCUSDT with no changes."
+
+
+def test_astream_trader_response_non_streaming_model(monkeypatch):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=_SUMMARY_TEXT)]), disable_streaming=True)
+    
+    result, deltas = _stream_response(monkeypatch, model)
+    
+    assert isinstance(result, AIMessage)
+    assert result.content == _SUMMARY_TEXT
+    assert deltas == []
+
+
+def _status_snapshot(position, orders):
+    status = {"symbol": "BTCUSDT", "account": {"total_equity": 1000.0}}
+    if position is not None:
+        status["position"] = position
+    if orders is not None:
+        status["orders"] = orders
+    return json.dumps(status)
+
+
+def test_is_flat_without_orders_flat_account():
+    snapshot = _status_snapshot({"position_exists": False}, {"open_orders_count": 0, "open_orders": []})
+    assert _is_flat_without_orders(snapshot) is True
+
+
+@pytest.mark.parametrize("position, orders", [
+    # Open position or resting orders
+    ({"position_exists": True, "side": "LONG"}, {"open_orders_count": 0, "open_orders": []}),
+    ({"position_exists": False}, {"open_orders_count": 2, "open_orders": [{}, {}]}),
+    # Fetch failures reported as empty sections by get_comprehensive_trading_status
+    ({"position_exists": False, "message": "No position for BTCUSDT"}, {"open_orders_count": 0, "open_orders": []}),
+    ({"position_exists": False}, {"open_orders_count": 0, "open_orders": [], "error": "Failed to fetch open orders for BTCUSDT"}),
+    # Missing sections
+    (None, {"open_orders_count": 0, "open_orders": []}),
+    ({"position_exists": False}, None),
+])
+def test_is_flat_without_orders_not_confirmed(position, orders):
+    assert _is_flat_without_orders(_status_snapshot(position, orders)) is False
+
+
+@pytest.mark.parametrize("snapshot", ["", "not json", json.dumps({"error": "API error"})])
+def test_is_flat_without_orders_unusable_snapshot(snapshot):
+    assert _is_flat_without_orders(snapshot) is False
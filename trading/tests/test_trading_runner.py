@@ -0,0 +1,26 @@
+"""Tests for LLM initialization in the trading runner."""
+
+import asyncio
+
+import httpx
+
+from tradingagents import trading_runner
+from tradingagents.config import LLMConfig
+
+
+def test_initialize_llm_uses_the_async_client_of_each_run(monkeypatch):
+    monkeypatch.setattr(trading_runner, "get_api_key_for_model", lambda model: "test-key")
+    
+    async def build_llm():
+        async with httpx.AsyncClient(limits=trading_runner._HTTP_LIMITS) as http_async_client:
+            llm = trading_runner.initialize_llm(LLMConfig(model="deepseek-chat"), http_async_client=http_async_client)
+            assert llm.http_async_client is http_async_client
+            assert llm.http_client is trading_runner._SHARED_HTTP_CLIENT
+            return http_async_client
+    
+    # Two runs in one process, each on a fresh event loop, get separate clients
+    first = asyncio.run(build_llm())
+    second = asyncio.run(build_llm())
+    
+    assert first is not second
+    assert first.is_closed and second.is_closed
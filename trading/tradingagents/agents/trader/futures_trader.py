@@ -7,69 +7,70 @@ Uses single-pass execution with tool binding for maximum flexibility.
 Architecture: Agent-Centric - LLM autonomously decides tool calls and execution flow.
 """
 
+import asyncio
+import json
+import re
+import string
+from typing import Optional
+
 from loguru import logger
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    HumanMessage,
+    SystemMessage,
+    message_chunk_to_message,
+)
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_openai import ChatOpenAI
+from langgraph.config import get_stream_writer
 from tradingagents.agents.utils.analysis_recorder import record_agent_execution
-
-
-def create_trader(llm):
-    """
-    Construct the futures trader node.
-    
-    Uses optimized single-pass execution:
-    - LLM autonomously calls tools as needed
-    - No manual state machine
-    - Maximum flexibility for handling edge cases
-    
-    Args:
-        llm: Language model instance.
-        
-    Returns:
-        Trader node callable.
-    """
-    
-    def trader_node(state):
-        symbol = state["trading_symbol"]
-        portfolio_plan = state.get("portfolio_plan", "")
-        
-        if not portfolio_plan:
-            raise ValueError("Portfolio plan is required for execution")
-        
-        # Note: We no longer skip HOLD actions
-        # HOLD requires checking if protective orders are still valid
-        
-        # Import execution tools
-        from tradingagents.agents.utils.futures_execution_tools import (
-            get_comprehensive_trading_status,
-            cancel_order,
-            cancel_all_orders_for_symbol,
-            open_long_position,
-            open_short_position,
-            close_position,
-            update_sl_tp,
-            update_sl_tp_safe,
-            reduce_position,
-        )
-        
-        tools = [
-            get_comprehensive_trading_status,
-            cancel_order,
-            cancel_all_orders_for_symbol,
-            open_long_position,
-            open_short_position,
-            close_position,
-            update_sl_tp_safe,  # Use safe version with built-in safety checks
-            reduce_position,
-        ]
-        
-        # Build comprehensive trader prompt
-        # This guides the LLM through systematic execution while preserving autonomy
-        system_message = f"""You are the **Futures Trader Agent**. Execute the portfolio plan autonomously and systematically.
+from tradingagents.agents.utils.futures_execution_tools import (
+    get_comprehensive_trading_status,
+    cancel_order,
+    cancel_all_orders_for_symbol,
+    open_long_position,
+    open_short_position,
+    close_position,
+    update_sl_tp_safe,
+    reduce_position,
+)
+
+
+# Execution tools bound to the trader LLM
+_TRADER_TOOLS = [
+    get_comprehensive_trading_status,
+    cancel_order,
+    cancel_all_orders_for_symbol,
+    open_long_position,
+    open_short_position,
+    close_position,
+    update_sl_tp_safe,  # Use safe version with built-in safety checks
+    reduce_position,
+]
+
+
+# Matches both "Decision: HOLD" and the bold "**Decision**: HOLD" / "**Decision:** [HOLD]"
+_PLAN_DECISION_RE = re.compile(r"\**Decision\**:\s*\**\s*\[?\s*([A-Z_]+)")
+
+# Upper bound on the speculative status fetch; on timeout the LLM fetches it itself
+_STATUS_PREFETCH_TIMEOUT_SECONDS = 10
+
+# Header the LLM places before its Phase 4 summary; the regex also accepts
+# variations without the markdown prefix in a single scan
+_SUMMARY_MARKER = "### 💭 Trade Execution Summary"
+_SUMMARY_MARKER_RE = re.compile(r"(?:###\s*💭\s*)?Trade Execution Summary")
+
+# Invariant trader instructions. Kept free of per-call values so the system
+# prompt is byte-identical across invocations and eligible for provider-side
+# prefix caching (OpenAI requires a stable prefix of at least 1024 tokens);
+# the symbol and plan travel in the trailing trading context message.
+_TRADER_SYSTEM_PREFIX = """You are the **Futures Trader Agent**. Execute the portfolio plan autonomously and systematically.
 
 ⚠️ **Account Configuration**: Multi-Assets (Cross Margin) mode is active. Isolated margin may not be available.
 
-**📋 PORTFOLIO PLAN TO EXECUTE:**
-{portfolio_plan}
+**📋 TARGET SYMBOL AND PORTFOLIO PLAN:** provided in the TRADING CONTEXT message that follows these instructions.
 
 ---
 
@@ -80,7 +81,7 @@ def create_trader(llm):
 ⚠️ **MANDATORY FIRST STEP:**
 
 1. **Call `prepare_trading_environment()`** with parameters from the portfolio plan:
-   - symbol: "{symbol}"
+   - symbol: the target symbol
    - new_action: [DECISION from portfolio plan - "LONG"/"SHORT"/"HOLD"/"EXIT"/"REDUCE"]
    - stop_loss_price: [from portfolio plan]
    - take_profit_price: [from portfolio plan]
@@ -113,7 +114,7 @@ Based on the environment preparation result:
     * Do NOT proceed with risky operations
 
 **If `is_reversing: true` in status:**
-→ Must call `close_position("{symbol}")` first before opening new position in Phase 3
+→ Must call `close_position()` on the target symbol first before opening new position in Phase 3
 
 **Phase 3: Execute Trading Action**
 
@@ -124,22 +125,10 @@ Based on the **DECISION** in the portfolio plan and your assessment from Phase 1
 2. No additional action needed
 3. Proceed to Phase 4 to generate report
 
-**If LONG (to open a NEW position):**
+**If LONG or SHORT (to open a NEW position):**
 1. Environment is already prepared in Phase 1 (cleanup done)
-2. Call `open_long_position()` with parameters:
-   - symbol: "{symbol}"
-   - position_size_usd: [from plan]
-   - leverage: [from plan]
-   - entry_price: [from plan, or None for MARKET order]
-   - stop_loss_price: [from plan]
-   - take_profit_price: [from plan - use first TP level]
-3. Verify the order was placed successfully
-4. Proceed to Phase 4
-
-**If SHORT (to open a NEW position):**
-1. Environment is already prepared in Phase 1 (cleanup done)
-2. Call `open_short_position()` with parameters:
-   - symbol: "{symbol}"
+2. Call `open_long_position()` (LONG) or `open_short_position()` (SHORT) with parameters:
+   - symbol: the target symbol
    - position_size_usd: [from plan]
    - leverage: [from plan]
    - entry_price: [from plan, or None for MARKET order]
@@ -154,14 +143,14 @@ Based on the **DECISION** in the portfolio plan and your assessment from Phase 1
 
 **If REDUCE:**
 1. Call `reduce_position()` with:
-   - symbol: "{symbol}"
+   - symbol: the target symbol
    - reduce_percentage: [from plan, typically 50%]
 2. Verify the reduction was executed
 3. Proceed to Phase 4
 
 **If EXIT / CLOSE:**
 1. Call `close_position()` with:
-   - symbol: "{symbol}"
+   - symbol: the target symbol
 2. Verify the position was closed
 3. Proceed to Phase 4
 
@@ -205,37 +194,246 @@ If any tool call fails:
 1. **Be Systematic**: Follow the phases in order
 2. **Be Autonomous**: Make intelligent decisions when needed
 3. **Be Concise**: Output only the plain language summary, no technical reports
+4. **Be Parallel**: When tool calls do not depend on each other's results, request them together in one turn
 
 ---
 
 **NOW EXECUTE THE PLAN.** Call the necessary tools and generate a concise trade summary."""
+
+
+# Per-call trading context, sent after the static prefix
+_TRADING_CONTEXT_TEMPLATE = string.Template("""**TRADING CONTEXT**
+
+- Target symbol: $symbol
+
+**📋 PORTFOLIO PLAN:**
+$portfolio_plan""")
+
+_TRADING_STATUS_TEMPLATE = string.Template("""
+
+**📊 CURRENT TRADING STATUS** (fetched at the start of this execution; no need to call `get_comprehensive_trading_status` again unless you need a post-trade refresh):
+$status""")
+
+
+def _cacheable_content(llm, text: str):
+    """
+    Wrap message text so the provider may cache the prompt up to this point.
+    
+    Anthropic only caches prompt prefixes that carry an explicit cache_control
+    breakpoint; OpenAI-compatible providers cache long stable prefixes automatically.
+    """
+    if isinstance(llm, ChatAnthropic):
+        return [{
+            "type": "text",
+            "text": text,
+            "cache_control": {"type": "ephemeral"},
+        }]
+    return text
+
+
+def _bind_trader_tools(llm):
+    """
+    Bind the execution tools, asking for parallel tool calls where supported.
+    
+    ToolNode runs every call of a multi-call turn concurrently, so independent
+    calls cost max(latency) instead of their sum. The flag is only sent to the
+    OpenAI API itself; Anthropic allows parallel tool use by default, and
+    OpenAI-compatible endpoints (e.g. DeepSeek) may reject the parameter.
+    """
+    if isinstance(llm, ChatOpenAI) and not llm.openai_api_base:
+        return llm.bind_tools(_TRADER_TOOLS, parallel_tool_calls=True)
+    return llm.bind_tools(_TRADER_TOOLS)
+
+
+def _parse_plan_decision(portfolio_plan: str) -> Optional[str]:
+    """Extract the DECISION value (e.g. "HOLD") from a portfolio plan, if present."""
+    match = _PLAN_DECISION_RE.search(portfolio_plan)
+    return match.group(1) if match else None
+
+
+def _is_flat_without_orders(status_snapshot: str) -> bool:
+    """
+    Return True if the status snapshot confirms no position and no open orders.
+    
+    get_comprehensive_trading_status reports a failed position or order fetch
+    as an empty section tagged with "message"/"error"; such snapshots (and
+    missing sections) are treated as unknown, so the LLM still runs.
+    """
+    try:
+        status = json.loads(status_snapshot)
+        position = status["position"]
+        orders = status["orders"]
+    except (ValueError, KeyError, TypeError):
+        return False
+    
+    for section in (position, orders):
+        if not isinstance(section, dict) or "error" in section or "message" in section:
+            return False
+    return position.get("position_exists") is False and orders.get("open_orders_count") == 0
+
+
+async def _prefetch_trading_status(symbol: str) -> str:
+    """
+    Fetch the comprehensive trading status ahead of the first LLM call.
+    
+    The trader reads this status on virtually every run, so handing it over
+    in the trading context saves a full LLM/tool round-trip.
+    
+    Returns:
+        Status JSON string, or "" if the fetch failed or timed out.
+    """
+    try:
+        status = await asyncio.wait_for(
+            get_comprehensive_trading_status.ainvoke({"symbol": symbol}),
+            timeout=_STATUS_PREFETCH_TIMEOUT_SECONDS,
+        )
+        error = json.loads(status).get("error")
+        if error:
+            raise RuntimeError(error)
+        return status
+    except Exception as e:
+        logger.warning(f"⚠️ Trading status prefetch failed for {symbol}, LLM will fetch it: {e}")
+        return ""
+
+
+async def _astream_trader_response(chain, inputs: dict) -> AIMessage:
+    """
+    Stream the trader LLM response, forwarding the summary as it is generated.
+    
+    Once the Phase 4 summary header appears, every new piece of text is sent
+    to LangGraph's "custom" stream as {"trader_summary_delta": text}, so
+    consumers streaming with stream_mode="custom" see it before generation
+    completes. Tool-calling turns are accumulated silently. Models that do
+    not stream (disable_streaming=True, or no _astream) yield one finished
+    AIMessage, which is returned as-is.
+    
+    Returns:
+        The complete response message.
+    """
+    writer = get_stream_writer()
+    result = None
+    streamed_upto = None
+    
+    async for chunk in chain.astream(inputs):
+        if not isinstance(chunk, AIMessageChunk):
+            return chunk
+        result = chunk if result is None else result + chunk
+        if result.tool_call_chunks or not isinstance(result.content, str):
+            continue
+        
+        if streamed_upto is None:
+            marker = _SUMMARY_MARKER_RE.search(result.content)
+            if marker is None:
+                continue
+            streamed_upto = marker.end()
+        
+        if len(result.content) > streamed_upto:
+            writer({"trader_summary_delta": result.content[streamed_upto:]})
+            streamed_upto = len(result.content)
+    
+    if result is None:
+        raise RuntimeError("Trader LLM returned an empty response stream")
+    return message_chunk_to_message(result)
+
+
+def create_trader(llm, short_circuit_idle_hold: bool = False):
+    """
+    Construct the futures trader node.
+    
+    Uses optimized single-pass execution:
+    - LLM autonomously calls tools as needed
+    - No manual state machine
+    - Maximum flexibility for handling edge cases
+    
+    Args:
+        llm: Language model instance. Latency options (e.g. OpenAI's priority
+            service tier via `llm_latency_optimized` in config.yaml) must be
+            configured on the model before it is passed in; see initialize_llm.
+        short_circuit_idle_hold: Finish HOLD plans without an LLM call when the
+            account has no position and no open orders (nothing to protect).
+        
+    Returns:
+        Async trader node callable (run the graph with astream/ainvoke).
+    """
+    # Prompt and tool schemas depend only on the LLM, so build the chain once
+    prompt = ChatPromptTemplate.from_messages([
+        SystemMessage(content=_cacheable_content(llm, _TRADER_SYSTEM_PREFIX)),
+        MessagesPlaceholder(variable_name="messages"),
+    ])
+    chain = prompt | _bind_trader_tools(llm)
+    
+    async def trader_node(state):
+        symbol = state["trading_symbol"]
+        portfolio_plan = state.get("portfolio_plan", "")
+        
+        if not portfolio_plan:
+            raise ValueError("Portfolio plan is required for execution")
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "{system_message}"),
-            MessagesPlaceholder(variable_name="messages"),
-        ])
+        decision = _parse_plan_decision(portfolio_plan)
+        if decision is None:
+            logger.warning(f"⚠️ Portfolio plan for {symbol} has no parseable Decision line")
+        
+        # Note: We no longer skip HOLD actions when a position exists
+        # HOLD requires checking if protective orders are still valid
+        
+        # Speculatively fetch trading status on the first visit; later visits
+        # reuse the stored snapshot so the trading context stays byte-stable
+        status_snapshot = state.get("trading_status_snapshot")
+        status_task = None
+        if status_snapshot is None:
+            status_task = asyncio.create_task(_prefetch_trading_status(symbol))
+        
+        # The trader only needs its own tool rounds: the plan and status in the
+        # trading context replace the analysts' conversation history
+        history_start = state.get("trader_history_start")
+        if history_start is None:
+            history_start = len(state["messages"])
+        
+        # Static instructions first, per-call symbol/plan last so the provider
+        # can serve the shared prefix from its prompt cache
+        trading_context = _TRADING_CONTEXT_TEMPLATE.substitute(
+            symbol=symbol,
+            portfolio_plan=portfolio_plan,
+        )
         
-        prompt = prompt.partial(system_message=system_message)
-        chain = prompt | llm.bind_tools(tools)
+        if status_task is not None:
+            status_snapshot = await status_task
+            
+            # HOLD on a flat account with no orders has nothing to protect or clean up
+            if short_circuit_idle_hold and decision == "HOLD" and _is_flat_without_orders(status_snapshot):
+                trade_summary = f"Holding {symbol} with no open position and no open orders. No changes were required."
+                logger.info(f"✅ Trade complete for {symbol} (idle HOLD short-circuited, no LLM call)")
+                record_agent_execution(state, "trader_summary", trade_summary)
+                return {
+                    "messages": [AIMessage(content=f"{_SUMMARY_MARKER}\n\n{trade_summary}")],
+                    "trade_report_summary": trade_summary,
+                    "trading_status_snapshot": status_snapshot,
+                    "trader_history_start": history_start,
+                    "sender": "trader",
+                }
+        if status_snapshot:
+            trading_context += _TRADING_STATUS_TEMPLATE.substitute(status=status_snapshot)
         
         # Single-pass execution: LLM autonomously calls tools until completion
-        result = chain.invoke(state["messages"])
+        # Streamed asynchronously: frees the event loop and surfaces the summary early
+        context_message = HumanMessage(content=_cacheable_content(llm, trading_context))
+        result = await _astream_trader_response(chain, {
+            "messages": [context_message, *state["messages"][history_start:]],
+        })
         
         # Check if LLM wants to call tools
-        # Different LLM providers store tool_calls in different places
-        has_tool_calls = False
-        if hasattr(result, 'tool_calls') and result.tool_calls:
-            has_tool_calls = True
-        elif hasattr(result, 'additional_kwargs'):
-            additional = getattr(result, 'additional_kwargs', {}) or {}
-            if additional.get('tool_calls'):
-                has_tool_calls = True
+        # AIMessage.tool_calls is normalized by LangChain for every provider
+        has_tool_calls = bool(result.tool_calls)
         
         # If LLM is calling tools, return and let ToolNode execute them
+        # Updates carry only the new message; MessagesState's add_messages reducer appends it
         if has_tool_calls:
-            logger.debug(f"Trader requesting tool calls for {symbol}")
+            # Positional args: loguru only formats when a sink accepts DEBUG
+            logger.debug("Trader requesting {} tool call(s) for {}", len(result.tool_calls), symbol)
             return {
-                "messages": state["messages"] + [result],
+                "messages": [result],
+                "trading_status_snapshot": status_snapshot,
+                "trader_history_start": history_start,
                 "sender": "trader",
             }
 
@@ -245,30 +443,25 @@ If any tool call fails:
         # Remove the markdown header if present (for consistency with other agents)
         # LLM outputs: "### 💭 Trade Execution Summary\n\nActual summary..."
         # We want only: "Actual summary..."
-        trade_summary = full_content
-        if "### 💭 Trade Execution Summary" in full_content:
-            parts = full_content.split("### 💭 Trade Execution Summary", 1)
-            if len(parts) > 1:
-                trade_summary = parts[1].strip()
-        elif "Trade Execution Summary" in full_content:
-            # Fallback: handle variations
-            parts = full_content.split("Trade Execution Summary", 1)
-            if len(parts) > 1:
-                trade_summary = parts[1].strip()
+        marker = _SUMMARY_MARKER_RE.search(full_content)
+        trade_summary = full_content[marker.end():].strip() if marker else full_content
         
         if not trade_summary:
             logger.warning("Trader returned empty summary; this may indicate an incomplete trade")
             trade_summary = "⚠️ Trade completed but no summary was generated"
         
         logger.info(f"✅ Trade complete for {symbol}")
-        logger.debug(f"Summary length: {len(trade_summary)} characters")
+        logger.debug("Summary length: {} characters", len(trade_summary))
         
         # Record execution to external API (only the concise summary)
+        # Uploaded in the background so the API round-trip stays off the trade path
         record_agent_execution(state, "trader_summary", trade_summary)
         
         return {
-            "messages": state["messages"] + [result],
+            "messages": [result],
             "trade_report_summary": trade_summary,
+            "trading_status_snapshot": status_snapshot,
+            "trader_history_start": history_start,
             "sender": "trader",
         }
     
@@ -78,3 +78,7 @@ class AgentState(MessagesState):
     risk_assessment_summary: Annotated[str, "Plain language summary of risk manager thinking"]
     portfolio_plan_summary: Annotated[str, "Plain language summary of portfolio manager thinking"]
     trade_report_summary: Annotated[str, "Plain language summary of trader actions (concise, no technical details)"]
+
+    # ==================== TRADER CONTEXT ====================
+    trading_status_snapshot: Annotated[Optional[str], "Trading status JSON prefetched by the Trader before its first LLM call"]
+    trader_history_start: Annotated[Optional[int], "Index in messages where the Trader's own tool rounds begin"]
@@ -2,24 +2,187 @@
 Analysis recording utility for tracking agent executions.
 
 Records each agent's execution to an external API for monitoring and analytics.
-API calls are made synchronously to ensure reliable delivery of all records.
+Records are queued and uploaded in order by a single background worker over a
+pooled keep-alive httpx client, so agents never block on the API. Records queued within a
+short window are coalesced into one batch request, and pending uploads are
+drained at interpreter exit for a few seconds at most.
 """
 
+import atexit
 import os
-import requests
-from datetime import datetime
+import queue
+import threading
+import time
+import httpx
+from datetime import datetime, timezone
 from loguru import logger
 
+from tradingagents.agents.utils.json_utils import dumpb
 
-def _get_api_config():
-    """Get API configuration from environment variables (set by config.yaml)."""
-    return {
-        "base_url": os.getenv("ANALYSIS_API_URL", ""),
-        "auth_header": os.getenv("ANALYSIS_API_AUTH", "")
-    }
 
+# Per-request upload timeout in seconds
+_REQUEST_TIMEOUT_SECONDS = 5
+
+# How long the worker waits for more records before sending a batch, and the
+# default batch size (overridable via ANALYSIS_API_BATCH_SIZE)
+_BATCH_WINDOW_SECONDS = 0.2
+_DEFAULT_BATCH_SIZE = 32
+
+# Upper bound on waiting for queued uploads at interpreter exit
+_EXIT_FLUSH_TIMEOUT_SECONDS = 3
+
+# Records waiting for upload; a single worker drains them in FIFO order
+_record_queue: queue.Queue = queue.Queue(maxsize=1000)
+
+# Keep-alive client shared by all uploads (connection pooling instead of a
+# new TCP/TLS connection per record)
+_http_client = httpx.Client(
+    timeout=_REQUEST_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+
+# Worker thread, started on the first queued record
+_worker_thread = None
+_worker_lock = threading.Lock()
+
+# Cleared if the API has no batch endpoint; uploads then go one record at a time
+_batch_endpoint_available = True
+
+# API configuration, read from the environment on first use
+_api_config = None
+_api_config_lock = threading.Lock()
+
+
+def _get_api_config() -> dict:
+    """
+    Get API configuration from environment variables (set by config.yaml).
+
+    The environment is read once, on first use (config.yaml is applied after
+    this module is imported), and the derived URLs and headers are reused.
+    """
+    global _api_config
+
+    if _api_config is None:
+        with _api_config_lock:
+            if _api_config is None:
+                base_url = os.getenv("ANALYSIS_API_URL", "")
+                try:
+                    batch_size = max(1, int(os.getenv("ANALYSIS_API_BATCH_SIZE", _DEFAULT_BATCH_SIZE)))
+                except ValueError:
+                    batch_size = _DEFAULT_BATCH_SIZE
+                _api_config = {
+                    "enabled": bool(os.getenv("APP_ENV")),
+                    "base_url": base_url,
+                    "records_url": f"{base_url}/analysis-records",
+                    "batch_url": f"{base_url}/analysis-records/batch",
+                    "headers": {
+                        "Content-Type": "application/json",
+                        "auth_admin": os.getenv("ANALYSIS_API_AUTH", ""),
+                    },
+                    "batch_size": batch_size,
+                }
+    return _api_config
+
+
+def _post_json(url: str, body) -> httpx.Response:
+    """POST a JSON body to the analysis API over the shared client."""
+    return _http_client.post(
+        url,
+        content=dumpb(body),
+        headers=_get_api_config()["headers"],
+    )
+
+
+def _post_record(payload: dict) -> None:
+    """Upload a single record; failures are logged, never raised."""
+    role = payload["role"]
+
+    try:
+        response = _post_json(_get_api_config()["records_url"], payload)
+        response.raise_for_status()
+
+        logger.debug(f"✅ Recorded {role} execution for {payload['traderId']} (record: {payload['recordId'][:8]}...)")
+
+    except httpx.TimeoutException:
+        logger.warning(f"⚠️ Timeout recording {role} execution (API took >{_REQUEST_TIMEOUT_SECONDS}s)")
+    except httpx.HTTPError as e:
+        logger.warning(f"⚠️ Failed to record {role} execution: {e}")
+    except Exception as e:
+        logger.error(f"❌ Unexpected error recording {role} execution: {e}")
+
+
+def _post_batch(batch: list) -> None:
+    """Upload a batch of records in one request; failures are logged, never raised."""
+    global _batch_endpoint_available
+
+    if len(batch) == 1 or not _batch_endpoint_available:
+        for payload in batch:
+            _post_record(payload)
+        return
+
+    try:
+        response = _post_json(_get_api_config()["batch_url"], {"records": batch})
+        if response.status_code == 404:
+            logger.info("Analysis API has no batch endpoint, uploading records individually")
+            _batch_endpoint_available = False
+            for payload in batch:
+                _post_record(payload)
+            return
+        response.raise_for_status()
+
+        logger.debug(f"✅ Recorded {len(batch)} agent executions in one batch")
+
+    except httpx.TimeoutException:
+        logger.warning(f"⚠️ Timeout recording batch of {len(batch)} executions (API took >{_REQUEST_TIMEOUT_SECONDS}s)")
+    except httpx.HTTPError as e:
+        logger.warning(f"⚠️ Failed to record batch of {len(batch)} executions: {e}")
+    except Exception as e:
+        logger.error(f"❌ Unexpected error recording batch of {len(batch)} executions: {e}")
+
+
+def _collect_batch() -> list:
+    """Block for the next record, then gather any more queued within the batch window."""
+    batch = [_record_queue.get()]
+    batch_size = _get_api_config()["batch_size"]
+    deadline = time.monotonic() + _BATCH_WINDOW_SECONDS
+
+    while len(batch) < batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_record_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
 
 
+def _record_worker() -> None:
+    """Upload queued records forever (runs in a daemon thread)."""
+    while True:
+        batch = _collect_batch()
+        try:
+            _post_batch(batch)
+        finally:
+            for _ in batch:
+                _record_queue.task_done()
+
+
+def _ensure_worker() -> None:
+    """Start the upload worker thread if it is not running yet."""
+    global _worker_thread
+
+    if _worker_thread is not None:
+        return
+    with _worker_lock:
+        if _worker_thread is None:
+            _worker_thread = threading.Thread(
+                target=_record_worker,
+                name="analysis-record",
+                daemon=True,
+            )
+            _worker_thread.start()
+
 
 def send_analysis_record(
     trader_id: str,
@@ -29,11 +192,12 @@ def send_analysis_record(
     json_value: str = None,
 ) -> None:
     """
-    Send analysis record to external API synchronously.
-    
-    This function blocks until the API request completes or times out,
-    ensuring reliable delivery of all records. The timeout is set to 5 seconds.
-    
+    Queue an analysis record for upload to the external API.
+
+    Returns immediately; a background worker posts records in order, batching
+    those queued close together, with a 5 second timeout per request. If the
+    queue is full the record is dropped with a warning.
+
     Args:
         trader_id: Trader UUID from config.yaml
         role: Agent role name (e.g., "research_agent", "risk_manager", "portfolio_manager", "trader")
@@ -41,53 +205,36 @@ def send_analysis_record(
         record_id: UUID for the current trading round
         json_value: Optional stringified JSON for phased interaction records (used by research_agent)
     """
+    api_config = _get_api_config()
+
     # Disable uploads if APP_ENV is not configured
-    if not os.getenv("APP_ENV"):
+    if not api_config["enabled"]:
         logger.debug(f"Skipping record for {role} - APP_ENV not configured")
         return
-    
-    # Get API config at runtime (not at import time)
-    api_config = _get_api_config()
-    api_base_url = api_config["base_url"]
-    api_auth_header = api_config["auth_header"]
-    
+
     # Skip if API not configured
-    if not api_base_url:
+    if not api_config["base_url"]:
         logger.debug(f"Skipping record for {role} - API_BASE_URL not configured")
         return
-    
+
+    # Build request payload
+    payload = {
+        "traderId": trader_id,
+        "role": role,
+        "chat": chat,
+        "recordId": record_id,
+        "createdAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+    }
+
+    # Add jsonValue if provided (for research_agent phased records)
+    if json_value:
+        payload["jsonValue"] = json_value
+
+    _ensure_worker()
     try:
-        # Build request payload
-        payload = {
-            "traderId": trader_id,
-            "role": role,
-            "chat": chat,
-            "recordId": record_id,
-            "createdAt": datetime.utcnow().isoformat() + "Z",
-        }
-        
-        # Add jsonValue if provided (for research_agent phased records)
-        if json_value:
-            payload["jsonValue"] = json_value
-        
-        # Send request
-        url = f"{api_base_url}/analysis-records"
-        headers = {
-            "Content-Type": "application/json",
-            "auth_admin": api_auth_header,
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=5)
-        response.raise_for_status()
-        
-        logger.debug(f"✅ Recorded {role} execution for {trader_id} (record: {record_id[:8]}...)")
-        
-    except requests.exceptions.Timeout:
-        logger.warning(f"⚠️ Timeout recording {role} execution (API took >5s)")
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"⚠️ Failed to record {role} execution: {e}")
-    except Exception as e:
-        logger.error(f"❌ Unexpected error recording {role} execution: {e}")
+        _record_queue.put_nowait(payload)
+    except queue.Full:
+        logger.warning(f"⚠️ Analysis record queue full, dropping {role} record")
 
 
 def record_agent_execution(
@@ -97,12 +244,12 @@ def record_agent_execution(
     json_value: str = None,
 ) -> None:
     """
-    Record an agent's execution to the API synchronously.
-    
+    Record an agent's execution to the API without blocking.
+
     This is a convenience wrapper that extracts necessary info from state
-    and calls send_analysis_record. The API call is blocking to ensure
-    reliable delivery of all records.
-    
+    and calls send_analysis_record, which queues the record for the
+    background upload worker.
+
     Args:
         state: Current agent state
         agent_name: Agent name (e.g., "research_agent", "risk_manager", "portfolio_manager", "trader")
@@ -111,14 +258,13 @@ def record_agent_execution(
     """
     # Get trader ID from state (UUID from config.yaml)
     trader_id = state.get("trader_id", "Unknown")
-    
+
     # Get record ID (UUID for this trading round)
     record_id = state.get("record_id")
     if not record_id:
         logger.warning(f"⚠️ No record_id in state, skipping recording for {agent_name}")
         return
-    
-    # Send the record synchronously
+
     send_analysis_record(
         trader_id=trader_id,
         role=agent_name,
@@ -126,3 +272,33 @@ def record_agent_execution(
         record_id=record_id,
         json_value=json_value,
     )
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """
+    Wait briefly for queued record uploads at exit, then close the HTTP client.
+    
+    A slow or unreachable API must not stall shutdown, so records still queued
+    after _EXIT_FLUSH_TIMEOUT_SECONDS are dropped with a warning.
+    """
+    deadline = time.monotonic() + _EXIT_FLUSH_TIMEOUT_SECONDS
+    with _record_queue.all_tasks_done:
+        while _record_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _record_queue.all_tasks_done.wait(remaining)
+    
+    dropped = 0
+    while True:
+        try:
+            _record_queue.get_nowait()
+        except queue.Empty:
+            break
+        _record_queue.task_done()
+        dropped += 1
+    if dropped:
+        logger.warning(f"⚠️ Analysis API did not respond in time, dropping {dropped} queued record(s) at exit")
+    
+    _http_client.close()
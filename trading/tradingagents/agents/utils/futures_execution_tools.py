@@ -311,7 +311,7 @@ def get_comprehensive_trading_status(symbol: str) -> str:
                     "open_orders": formatted_orders,
                 }
         except Exception:
-            open_orders_info = {"open_orders_count": 0, "open_orders": []}
+            open_orders_info = {"open_orders_count": 0, "open_orders": [], "error": f"Failed to fetch open orders for {symbol}"}
         
         # 4. Consolidate results
         result = {
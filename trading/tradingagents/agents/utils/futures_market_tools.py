@@ -5,17 +5,56 @@ Provides helper functions required for futures market analysis.
 """
 
 from langchain_core.tools import tool
-import json
+import bisect
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-import pandas as pd
-import pandas_ta as ta
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple, Union
+from loguru import logger
+from tradingagents.agents.utils.json_utils import compact_rows, dumps
 from tradingagents.dataflows.asterdex_futures_api import AsterFuturesClient
 
+try:
+    # numba (a declared dependency) compiles the indicator kernels. The
+    # kernels declare explicit signatures, so they are compiled (or loaded
+    # from the on-disk cache) at import time rather than inside the first tool call.
+    from numba import njit
+except ImportError:  # pragma: no cover - run the kernels as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 
 # Global client instance - will be set during initialization
 _client = None
 
+# Market data responses shared across tool calls: (method, *args) ->
+# (expires_at, response), in least-recently-used order. Several tools request
+# the same endpoints within one agent turn; each method's TTL bounds how stale
+# a reused response can be, and the size cap bounds keys from LLM-chosen limits.
+_MARKET_DATA_CACHE: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+_MARKET_DATA_CACHE_MAX_ENTRIES = 64
+_MARKET_DATA_CACHE_LOCK = threading.Lock()
+_MARKET_DATA_TTL_SECONDS = {
+    "get_klines": 30,
+    "get_mark_price": 5,
+    "get_open_interest": 5,
+    "get_ticker_24hr": 60,
+    "get_funding_rate_history": 60,
+}
+
+# Worker threads for independent market data requests (network-bound, so the
+# GIL is released while they wait)
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-data")
+
+# Last indicators per (symbol, interval): (kline window fingerprint,
+# (atr_14, sma_50, sma_200)). Closed bars never change, so an unchanged first
+# bar and last bar mean the indicators from the previous call still hold.
+_INDICATOR_CACHE: Dict[Tuple[str, str], Tuple[Tuple, Tuple[float, float, float]]] = {}
+
 
 def initialize_futures_client(api_key: str, api_secret: str, base_url: str = "https://fapi.asterdex.com") -> None:
     """
@@ -28,6 +67,8 @@ def initialize_futures_client(api_key: str, api_secret: str, base_url: str = "ht
     """
     global _client
     _client = AsterFuturesClient(api_key=api_key, api_secret=api_secret, base_url=base_url)
+    _MARKET_DATA_CACHE.clear()
+    _INDICATOR_CACHE.clear()
 
 
 def get_futures_client() -> AsterFuturesClient:
@@ -46,13 +87,119 @@ def get_futures_client() -> AsterFuturesClient:
     return _client
 
 
-def calculate_atr(klines: List[Dict], period: int = 14) -> float:
+# Kline fields used by the indicators, in column order
+_SOA_FIELDS = ("high", "low", "close")
+
+
+def _cached_market_data(client: AsterFuturesClient, method: str, *args) -> Any:
+    """
+    Call a read-only client method, reusing its response within the method's TTL.
+    
+    Cached responses are shared between callers and must not be mutated.
+    Expired entries are dropped on lookup, and the least recently used entry
+    is evicted once the cache holds _MARKET_DATA_CACHE_MAX_ENTRIES.
+    """
+    key = (method, *args)
+    now = time.monotonic()
+    with _MARKET_DATA_CACHE_LOCK:
+        entry = _MARKET_DATA_CACHE.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _MARKET_DATA_CACHE.move_to_end(key)
+                return entry[1]
+            del _MARKET_DATA_CACHE[key]
+    
+    # Fetch outside the lock so concurrent requests for other keys proceed
+    response = getattr(client, method)(*args)
+    with _MARKET_DATA_CACHE_LOCK:
+        _MARKET_DATA_CACHE[key] = (now + _MARKET_DATA_TTL_SECONDS[method], response)
+        _MARKET_DATA_CACHE.move_to_end(key)
+        while len(_MARKET_DATA_CACHE) > _MARKET_DATA_CACHE_MAX_ENTRIES:
+            _MARKET_DATA_CACHE.popitem(last=False)
+    return response
+
+
+def _klines_to_soa(klines: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Transpose kline dictionaries into contiguous float64 arrays.
+    
+    The klines are walked once; each indicator then reads the arrays
+    instead of re-extracting fields from every dictionary.
+    
+    Args:
+        klines: Sequence of kline dictionaries.
+        
+    Returns:
+        Mapping of "high", "low" and "close" to float64 arrays.
+    """
+    rows = np.array(
+        [(k["high"], k["low"], k["close"]) for k in klines],
+        dtype=np.float64,
+    ).reshape(-1, len(_SOA_FIELDS))
+    return dict(zip(_SOA_FIELDS, np.ascontiguousarray(rows.T)))
+
+
+@njit("f8(f8[:], f8[:], f8[:], i8)", cache=True)
+def _atr_wilder_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
     """
-    Compute the Average True Range (ATR) using the pandas-ta implementation.
+    Return the last Wilder-smoothed ATR in a single pass.
+    
+    Matches pandas-ta's default ATR: the first true range is high - low, the
+    average is seeded with the SMA of the first ``period`` true ranges and
+    then smoothed with atr = (atr * (period - 1) + tr) / period.
+    """
+    atr = 0.0
+    for i in range(high.shape[0]):
+        tr = high[i] - low[i]
+        if i > 0:
+            prev_close = close[i - 1]
+            tr = max(tr, abs(high[i] - prev_close), abs(low[i] - prev_close))
+        if i < period:
+            atr += tr
+            if i == period - 1:
+                atr /= period
+        else:
+            atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+def calculate_atr_from_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+) -> float:
+    """
+    Compute the Average True Range (ATR) with Wilder's smoothing.
     
     Standard ATR uses an exponential moving average (EMA) rather than a
     simple moving average (SMA), providing a more responsive volatility
-    signal.
+    signal. Computed by a compiled kernel over float64 arrays; results
+    match pandas-ta's ``ta.atr``.
+    
+    Args:
+        high: High prices as a float64 array.
+        low: Low prices as a float64 array.
+        close: Close prices as a float64 array.
+        period: ATR window length (default 14).
+        
+    Returns:
+        Latest ATR value.
+    """
+    if close.size < period + 1:
+        return 0.0
+    
+    # Compute the EMA-based ATR and return the most recent value
+    atr = _atr_wilder_last(high, low, close, period)
+    return atr if math.isfinite(atr) else 0.0
+
+
+def calculate_atr(klines: List[Dict], period: int = 14) -> float:
+    """
+    Compute the ATR of kline dictionaries.
+    
+    Callers that already hold the price arrays from _klines_to_soa should use
+    calculate_atr_from_arrays instead.
     
     Args:
         klines: Sequence of kline dictionaries.
@@ -65,37 +212,27 @@ def calculate_atr(klines: List[Dict], period: int = 14) -> float:
         return 0.0
     
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame(klines)
-        
-        # Ensure numeric dtype
-        df['high'] = pd.to_numeric(df['high'], errors='coerce')
-        df['low'] = pd.to_numeric(df['low'], errors='coerce')
-        df['close'] = pd.to_numeric(df['close'], errors='coerce')
-        
-        # Use pandas-ta to compute the EMA-based ATR
-        atr_values = ta.atr(
-            high=df['high'], 
-            low=df['low'], 
-            close=df['close'], 
-            length=period
-        )
-        
-        # Return the most recent value
-        if len(atr_values) > 0 and not pd.isna(atr_values.iloc[-1]):
-            return float(atr_values.iloc[-1])
-        
+        arrays = _klines_to_soa(klines)
+        return calculate_atr_from_arrays(arrays["high"], arrays["low"], arrays["close"], period)
     except Exception as e:
         # On failure return 0.0
         print(f"ATR calculation error: {e}")
         return 0.0
-    
-    return 0.0
+
+
+@njit("f8(f8[:], i8)", cache=True)
+def _sma_last(values: np.ndarray, period: int) -> float:
+    """Return the mean of the last ``period`` values in a single summation loop."""
+    n = values.shape[0]
+    total = 0.0
+    for i in range(n - period, n):
+        total += values[i]
+    return total / period
 
 
 def calculate_sma(values: List[float], period: int) -> float:
     """
-    Compute a simple moving average via pandas-ta.
+    Compute the latest simple moving average value.
     
     Args:
         values: Price series.
@@ -108,40 +245,66 @@ def calculate_sma(values: List[float], period: int) -> float:
         return 0.0
     
     try:
-        # Convert to Series
-        series = pd.Series(values)
-        
-        # Compute SMA with pandas-ta
-        sma_values = ta.sma(series, length=period)
-        
-        # Return the most recent value
-        if len(sma_values) > 0 and not pd.isna(sma_values.iloc[-1]):
-            return float(sma_values.iloc[-1])
+        # Only the last window matters, so average it directly
+        sma = _sma_last(np.asarray(values, dtype=np.float64), period)
+        return sma if math.isfinite(sma) else 0.0
         
     except Exception as e:
         # Fall back to a simple average on failure
         print(f"SMA calculation error: {e}")
         return float(np.mean(values[-period:]))
+
+
+def _trend_indicators(
+    symbol: str,
+    interval: str,
+    klines: List[Dict],
+    arrays: Dict[str, np.ndarray],
+) -> Tuple[float, float, float]:
+    """
+    Return (atr_14, sma_50, sma_200) for a kline window, reusing the previous
+    result for this symbol and interval when the window has not changed.
+    
+    All three indicators read the price arrays the caller already built with
+    _klines_to_soa.
+    
+    sma_200 is 0 when fewer than 200 bars are available.
+    """
+    last = klines[-1]
+    fingerprint = (
+        len(klines), klines[0]["open_time"], last["open_time"],
+        last["high"], last["low"], last["close"],
+    )
+    entry = _INDICATOR_CACHE.get((symbol, interval))
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
     
-    return 0.0
+    closes = arrays["close"]
+    indicators = (
+        calculate_atr_from_arrays(arrays["high"], arrays["low"], closes, 14),
+        calculate_sma(closes, 50),
+        calculate_sma(closes, 200) if len(closes) >= 200 else 0,
+    )
+    _INDICATOR_CACHE[(symbol, interval)] = (fingerprint, indicators)
+    return indicators
 
 
-def detect_trend(klines: List[Dict], sma_50: float, sma_200: float) -> str:
+def detect_trend(closes: np.ndarray, sma_50: float, sma_200: float) -> str:
     """
     Detect trend direction.
     
     Args:
-        klines: Kline data.
+        closes: Close prices as a float64 array.
         sma_50: 50-period SMA.
         sma_200: 200-period SMA.
         
     Returns:
         Trend direction: "UP", "DOWN", or "SIDEWAYS".
     """
-    if len(klines) < 2:
+    if closes.size < 2:
         return "SIDEWAYS"
     
-    current_price = klines[-1]["close"]
+    current_price = closes[-1]
     
     # Compare moving averages first
     if sma_50 > 0 and sma_200 > 0:
@@ -151,7 +314,11 @@ def detect_trend(klines: List[Dict], sma_50: float, sma_200: float) -> str:
             return "DOWN"
     
     # Fall back to price change heuristic
-    price_change_pct = ((current_price - klines[-20]["close"]) / klines[-20]["close"]) * 100 if len(klines) >= 20 else 0
+    if closes.size >= 20:
+        reference_price = closes[-20]
+        price_change_pct = ((current_price - reference_price) / reference_price) * 100
+    else:
+        price_change_pct = 0
     
     if price_change_pct > 5:
         return "UP"
@@ -161,6 +328,29 @@ def detect_trend(klines: List[Dict], sma_50: float, sma_200: float) -> str:
     return "SIDEWAYS"
 
 
+# Classification bins shared by the scalar (bisect) and array (searchsorted)
+# classifiers: a value maps to the label at bisect_right(bins, value).
+# 4.0 and 1.5 themselves belong to the middle class, hence the nextafter bound.
+_VOLATILITY_BINS = (1.5, math.nextafter(4.0, math.inf))  # ATR as % of price
+_VOLATILITY_LABELS = ("LOW", "NORMAL", "HIGH")
+_PRESSURE_BINS = (0.67, math.nextafter(1.5, math.inf))  # bid/ask volume ratio
+_PRESSURE_LABELS = ("SELL_HEAVY", "BALANCED", "BUY_HEAVY")
+
+
+def classify_volatility_regimes(atr_pcts: np.ndarray) -> List[str]:
+    """
+    Classify an array of ATR percentages in one vectorized pass.
+    
+    Args:
+        atr_pcts: ATR values as a percentage of price.
+        
+    Returns:
+        "LOW", "NORMAL", or "HIGH" for each value.
+    """
+    indices = np.searchsorted(_VOLATILITY_BINS, atr_pcts, side="right")
+    return [_VOLATILITY_LABELS[i] for i in indices.tolist()]
+
+
 def detect_volatility_regime(atr: float, price: float) -> str:
     """
     Classify the volatility regime.
@@ -173,21 +363,47 @@ def detect_volatility_regime(atr: float, price: float) -> str:
         "LOW", "NORMAL", or "HIGH".
     """
     atr_pct = (atr / price) * 100 if price > 0 else 0
+    return _VOLATILITY_LABELS[bisect.bisect_right(_VOLATILITY_BINS, atr_pct)]
+
+
+@lru_cache(maxsize=32)
+def _analysis_intervals(primary_interval: str, secondary_intervals: str) -> Tuple[str, ...]:
+    """
+    Parse the interval arguments of get_comprehensive_market_analysis into
+    the ordered, de-duplicated intervals to analyse.
     
-    if atr_pct < 1.5:
-        return "LOW"
-    elif atr_pct > 4.0:
-        return "HIGH"
-    else:
-        return "NORMAL"
+    Agents call the tool with the same few interval combinations, so each
+    combination is parsed once.
+    """
+    secondary_tf_list = [tf.strip() for tf in secondary_intervals.split(",") if tf.strip()]
+    return tuple(dict.fromkeys([primary_interval] + secondary_tf_list))
+
+
+def _funding_rates(funding_rate_history: List[Dict]) -> np.ndarray:
+    """Extract the funding rates of a history payload as a float64 array."""
+    return np.fromiter(
+        (float(r["fundingRate"]) for r in funding_rate_history),
+        dtype=np.float64,
+        count=len(funding_rate_history),
+    )
+
+
+def _depth_to_soa(levels: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse orderbook levels ([[price, quantity], ...]) into price and
+    quantity float64 arrays in a single conversion.
+    """
+    parsed = np.array(levels, dtype=np.float64).reshape(-1, 2)
+    return np.ascontiguousarray(parsed[:, 0]), np.ascontiguousarray(parsed[:, 1])
 
 
-def analyze_funding_rate_trend(funding_rate_history: List[Dict]) -> str:
+def analyze_funding_rate_trend(funding_rate_history: Union[List[Dict], np.ndarray]) -> str:
     """
     Analyse funding rate trend.
     
     Args:
-        funding_rate_history: Funding rate history payload.
+        funding_rate_history: Funding rate history payload, or its rates as
+            returned by _funding_rates() when the caller already extracted them.
         
     Returns:
         Trend label: "BULLISH", "BEARISH", or "NEUTRAL".
@@ -196,8 +412,11 @@ def analyze_funding_rate_trend(funding_rate_history: List[Dict]) -> str:
         return "NEUTRAL"
     
     # Examine recent funding rates
-    recent_rates = [float(r["fundingRate"]) for r in funding_rate_history[-8:]]
-    avg_rate = np.mean(recent_rates)
+    if isinstance(funding_rate_history, np.ndarray):
+        recent_rates = funding_rate_history[-8:]
+    else:
+        recent_rates = _funding_rates(funding_rate_history[-8:])
+    avg_rate = recent_rates.mean()
     
     # Positive funding implies bullish sentiment; negative implies bearish
     if avg_rate > 0.0001:  # 0.01%
@@ -225,26 +444,21 @@ def get_futures_market_data(symbol: str, interval: str = "1h", limit: int = 200)
         client = get_futures_client()
         
         # 1. Fetch klines
-        klines = client.get_klines(symbol, interval, limit)
+        klines = _cached_market_data(client, "get_klines", symbol, interval, limit)
         
         # 2. Fetch mark price and funding rate
-        mark_data = client.get_mark_price(symbol)
+        mark_data = _cached_market_data(client, "get_mark_price", symbol)
         
         # 3. Fetch open interest
-        oi_data = client.get_open_interest(symbol)
+        oi_data = _cached_market_data(client, "get_open_interest", symbol)
         
         # 4. Fetch 24-hour ticker stats
-        ticker_24hr = client.get_ticker_24hr(symbol)
-        
-        # Derive key price lists
-        closes = [k["close"] for k in klines]
-        highs = [k["high"] for k in klines]
-        lows = [k["low"] for k in klines]
+        ticker_24hr = _cached_market_data(client, "get_ticker_24hr", symbol)
         
         result = {
             "symbol": symbol,
             "interval": interval,
-            "current_price": closes[-1],
+            "current_price": klines[-1]["close"],
             "mark_price": mark_data["mark_price"],
             "index_price": mark_data["index_price"],
             "24h_change_pct": float(ticker_24hr.get("priceChangePercent", 0)),
@@ -254,13 +468,13 @@ def get_futures_market_data(symbol: str, interval: str = "1h", limit: int = 200)
             "funding_rate": mark_data["funding_rate"],
             "next_funding_time": mark_data["next_funding_time"],
             "open_interest": oi_data["open_interest"],
-            "recent_klines": klines[-20:],  # Last 20 klines
+            "recent_klines": compact_rows(klines[-20:]),  # Last 20 klines, one per line
         }
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
 
 
 @tool
@@ -279,33 +493,30 @@ def get_futures_technical_features(symbol: str, interval: str = "1h") -> str:
         client = get_futures_client()
         
         # Ensure sufficient kline history
-        klines = client.get_klines(symbol, interval, 250)
+        klines = _cached_market_data(client, "get_klines", symbol, interval, 250)
         
         if len(klines) < 50:
-            return json.dumps({"error": "Insufficient data"})
+            return dumps({"error": "Insufficient data"})
         
-        # Extract price components
-        closes = [k["close"] for k in klines]
-        highs = [k["high"] for k in klines]
-        lows = [k["low"] for k in klines]
+        # Extract price components as arrays
+        arrays = _klines_to_soa(klines)
+        closes = arrays["close"]
+        highs = arrays["high"]
+        lows = arrays["low"]
         
         # Compute indicators
-        current_price = closes[-1]
-        atr_14 = calculate_atr(klines, 14)
-        sma_50 = calculate_sma(closes, 50)
-        sma_200 = calculate_sma(closes, 200) if len(closes) >= 200 else 0
+        current_price = float(closes[-1])
+        atr_14, sma_50, sma_200 = _trend_indicators(symbol, interval, klines, arrays)
         
         # Detect trend
-        trend = detect_trend(klines, sma_50, sma_200)
+        trend = detect_trend(closes, sma_50, sma_200)
         
         # Assess volatility regime
         volatility_regime = detect_volatility_regime(atr_14, current_price)
         
         # Derive simple support/resistance using the latest 50 bars
-        recent_highs = highs[-50:]
-        recent_lows = lows[-50:]
-        resistance_level = max(recent_highs)
-        support_level = min(recent_lows)
+        resistance_level = float(highs[-50:].max())
+        support_level = float(lows[-50:].min())
         
         result = {
             "symbol": symbol,
@@ -329,10 +540,10 @@ def get_futures_technical_features(symbol: str, interval: str = "1h") -> str:
             }
         }
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
 
 
 @tool
@@ -350,22 +561,24 @@ def get_funding_rate_analysis(symbol: str) -> str:
         client = get_futures_client()
         
         # Fetch funding rate history
-        funding_history = client.get_funding_rate_history(symbol, limit=24)  # Latest 24 periods
+        funding_history = _cached_market_data(client, "get_funding_rate_history", symbol, 24)  # Latest 24 periods
         
         if not funding_history:
-            return json.dumps({"error": "No funding rate data"})
+            return dumps({"error": "No funding rate data"})
+        
+        # Extract all rates once; trend and statistics share the array
+        rates = _funding_rates(funding_history)
         
         # Current funding rate
-        current_funding = float(funding_history[-1]["fundingRate"])
+        current_funding = float(rates[-1])
         
         # Determine trend direction
-        trend = analyze_funding_rate_trend(funding_history)
+        trend = analyze_funding_rate_trend(rates)
         
         # Compute descriptive statistics
-        rates = [float(r["fundingRate"]) for r in funding_history]
-        avg_rate = np.mean(rates)
-        max_rate = max(rates)
-        min_rate = min(rates)
+        avg_rate = float(rates.mean())
+        max_rate = float(rates.max())
+        min_rate = float(rates.min())
         
         result = {
             "symbol": symbol,
@@ -387,10 +600,10 @@ def get_funding_rate_analysis(symbol: str) -> str:
             "recent_history": funding_history[-8:]  # Most recent 8 entries
         }
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
 
 
 @tool
@@ -418,48 +631,55 @@ def get_exchange_trading_rules(symbol: str) -> str:
         # Fetch symbol filters (cached by client after first call, from futures API)
         filters = client.get_symbol_filters(symbol)
         
+        # Read each rule once; the explanations reuse the same values
+        get = filters.get
+        
         # Get min_notional - prefer NOTIONAL filter (futures) over MIN_NOTIONAL (spot)
-        min_notional = filters.get("min_notional", 0.0)
-        max_notional = filters.get("max_notional")
+        min_notional = get("min_notional", 0.0)
+        max_notional = get("max_notional")
+        min_qty = get("min_qty", 0.0)
+        step_size = get("step_size", 0.0)
+        tick_size = get("tick_size", 0.0)
+        contract_size = get("contract_size", 1.0)
         
         result = {
             "symbol": symbol,
             "contract_specs": {
-                "contract_type": filters.get("contract_type", ""),
-                "contract_size": filters.get("contract_size", 1.0),
-                "contract_status": filters.get("contract_status", ""),
-                "underlying_type": filters.get("underlying_type", ""),
+                "contract_type": get("contract_type", ""),
+                "contract_size": contract_size,
+                "contract_status": get("contract_status", ""),
+                "underlying_type": get("underlying_type", ""),
             },
             "trading_rules": {
                 "min_notional": min_notional,
                 "max_notional": max_notional,
-                "min_qty": filters.get("min_qty", 0.0),
-                "step_size": filters.get("step_size", 0.0),
-                "tick_size": filters.get("tick_size", 0.0),
-                "max_qty": filters.get("max_qty", 0.0),
-                "min_price": filters.get("min_price", 0.0),
-                "max_price": filters.get("max_price", 0.0),
-                "price_precision": filters.get("price_precision", 0),
-                "quantity_precision": filters.get("quantity_precision", 0),
+                "min_qty": min_qty,
+                "step_size": step_size,
+                "tick_size": tick_size,
+                "max_qty": get("max_qty", 0.0),
+                "min_price": get("min_price", 0.0),
+                "max_price": get("max_price", 0.0),
+                "price_precision": get("price_precision", 0),
+                "quantity_precision": get("quantity_precision", 0),
             },
             "order_limits": {
-                "max_num_orders": filters.get("max_num_orders"),
-                "max_num_algo_orders": filters.get("max_num_algo_orders"),
+                "max_num_orders": get("max_num_orders"),
+                "max_num_algo_orders": get("max_num_algo_orders"),
             },
             "explanation": {
-                "min_notional": f"Minimum order value must be at least ${filters.get('min_notional', 0.0)} USD",
-                "min_qty": f"Minimum quantity is {filters.get('min_qty', 0.0)} contracts",
-                "step_size": f"Quantity must be a multiple of {filters.get('step_size', 0.0)}",
-                "tick_size": f"Price must be a multiple of {filters.get('tick_size', 0.0)}",
-                "contract_size": f"Contract multiplier: {filters.get('contract_size', 1.0)} (futures-specific)",
+                "min_notional": f"Minimum order value must be at least ${min_notional} USD",
+                "min_qty": f"Minimum quantity is {min_qty} contracts",
+                "step_size": f"Quantity must be a multiple of {step_size}",
+                "tick_size": f"Price must be a multiple of {tick_size}",
+                "contract_size": f"Contract multiplier: {contract_size} (futures-specific)",
             },
             "note": f"These are hard exchange limits from /fapi/v1/exchangeInfo (futures API). Orders must satisfy BOTH min_notional (${min_notional}) and min_qty. Use current price to calculate the effective minimum. If min_notional seems too low, verify the API response contains 'NOTIONAL' filter (not 'MIN_NOTIONAL')."
         }
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
 
 
 @tool
@@ -477,10 +697,10 @@ def get_open_interest_analysis(symbol: str) -> str:
         client = get_futures_client()
         
         # Fetch current open interest
-        oi_data = client.get_open_interest(symbol)
+        oi_data = _cached_market_data(client, "get_open_interest", symbol)
         
         # Fetch 24-hour price statistics
-        ticker_24hr = client.get_ticker_24hr(symbol)
+        ticker_24hr = _cached_market_data(client, "get_ticker_24hr", symbol)
         price_change_pct = float(ticker_24hr.get("priceChangePercent", 0))
         
         result = {
@@ -500,10 +720,10 @@ def get_open_interest_analysis(symbol: str) -> str:
         else:
             result["interpretation"] = "Price relatively stable."
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
 
 
 @tool
@@ -537,58 +757,63 @@ def get_comprehensive_market_analysis(
         client = get_futures_client()
         
         # Parse secondary intervals
-        secondary_tf_list = [tf.strip() for tf in secondary_intervals.split(",") if tf.strip()]
-        all_intervals = [primary_interval] + secondary_tf_list
+        all_intervals = _analysis_intervals(primary_interval, secondary_intervals)
+        
+        # Issue every request up front; they are independent, so the tool waits
+        # for the slowest one instead of their sum
+        submit = _FETCH_EXECUTOR.submit
+        mark_future = submit(_cached_market_data, client, "get_mark_price", symbol)
+        oi_future = submit(_cached_market_data, client, "get_open_interest", symbol)
+        ticker_future = submit(_cached_market_data, client, "get_ticker_24hr", symbol)
+        funding_future = submit(_cached_market_data, client, "get_funding_rate_history", symbol, 24)
+        kline_futures = {
+            interval: submit(_cached_market_data, client, "get_klines", symbol, interval, 250)
+            for interval in all_intervals
+        }
+        depth_future = submit(client.get_depth, symbol, limit=20)
         
-        # 1. Fetch basic market data once
-        mark_data = client.get_mark_price(symbol)
-        oi_data = client.get_open_interest(symbol)
-        ticker_24hr = client.get_ticker_24hr(symbol)
-        funding_history = client.get_funding_rate_history(symbol, limit=24)
+        # 1. Basic market data
+        mark_data = mark_future.result()
+        oi_data = oi_future.result()
+        ticker_24hr = ticker_future.result()
+        funding_history = funding_future.result()
         
-        # 2. Fetch primary timeframe klines (for recent price action)
-        primary_klines = client.get_klines(symbol, primary_interval, 250)
+        # 2. Primary timeframe klines (for recent price action)
+        primary_klines = kline_futures[primary_interval].result()
         
         if len(primary_klines) < 50:
-            return json.dumps({"error": "Insufficient data for primary interval"})
+            return dumps({"error": "Insufficient data for primary interval"})
         
         # Extract basic price info from primary timeframe
-        primary_closes = [k["close"] for k in primary_klines]
-        current_price = primary_closes[-1]
+        current_price = primary_klines[-1]["close"]
         
         # 3. Build multi-timeframe technical analysis
         timeframe_analysis = {}
         
         for interval in all_intervals:
             try:
-                # Fetch klines for this interval
-                klines = client.get_klines(symbol, interval, 250)
+                # Klines for this interval
+                klines = kline_futures[interval].result()
                 
                 if len(klines) < 50:
                     timeframe_analysis[interval] = {"error": "Insufficient data"}
                     continue
                 
-                # Extract price components
-                closes = [k["close"] for k in klines]
-                highs = [k["high"] for k in klines]
-                lows = [k["low"] for k in klines]
+                # Extract price components as arrays
+                arrays = _klines_to_soa(klines)
+                closes = arrays["close"]
+                highs = arrays["high"]
+                lows = arrays["low"]
                 
                 # Calculate indicators
-                atr_14 = calculate_atr(klines, 14)
-                sma_50 = calculate_sma(closes, 50)
-                sma_200 = calculate_sma(closes, 200) if len(closes) >= 200 else 0
+                atr_14, sma_50, sma_200 = _trend_indicators(symbol, interval, klines, arrays)
                 
                 # Detect trend
-                trend = detect_trend(klines, sma_50, sma_200)
-                
-                # Assess volatility regime
-                volatility_regime = detect_volatility_regime(atr_14, closes[-1])
+                trend = detect_trend(closes, sma_50, sma_200)
                 
                 # Derive support/resistance from recent 50 bars
-                recent_highs = highs[-50:]
-                recent_lows = lows[-50:]
-                resistance_level = max(recent_highs)
-                support_level = min(recent_lows)
+                resistance_level = float(highs[-50:].max())
+                support_level = float(lows[-50:].min())
                 
                 timeframe_analysis[interval] = {
                     "current_price": closes[-1],
@@ -600,7 +825,6 @@ def get_comprehensive_market_analysis(
                     "volatility": {
                         "atr_14": atr_14,
                         "atr_pct": (atr_14 / closes[-1]) * 100,
-                        "regime": volatility_regime,
                     },
                     "levels": {
                         "support": support_level,
@@ -613,10 +837,18 @@ def get_comprehensive_market_analysis(
             except Exception as e:
                 timeframe_analysis[interval] = {"error": str(e)}
         
+        # Assess the volatility regime of all analysed intervals at once
+        volatilities = [a["volatility"] for a in timeframe_analysis.values() if "volatility" in a]
+        if volatilities:
+            atr_pcts = np.array([v["atr_pct"] for v in volatilities])
+            for volatility, regime in zip(volatilities, classify_volatility_regimes(atr_pcts)):
+                volatility["regime"] = regime
+        
         # 4. Funding rate analysis
-        current_funding = float(funding_history[-1]["fundingRate"]) if funding_history else 0
-        funding_trend = analyze_funding_rate_trend(funding_history)
-        rates = [float(r["fundingRate"]) for r in funding_history]
+        rates = _funding_rates(funding_history)
+        current_funding = float(rates[-1]) if rates.size else 0
+        funding_trend = analyze_funding_rate_trend(rates)
+        avg_rate = float(rates.mean())
         
         funding_analysis = {
             "current_funding_rate": current_funding,
@@ -624,10 +856,10 @@ def get_comprehensive_market_analysis(
             "annualized_rate": current_funding * 365 * 3 * 100,
             "trend": funding_trend,
             "statistics": {
-                "avg_rate": np.mean(rates),
-                "avg_rate_pct": np.mean(rates) * 100,
-                "max_rate": max(rates),
-                "min_rate": min(rates),
+                "avg_rate": avg_rate,
+                "avg_rate_pct": avg_rate * 100,
+                "max_rate": float(rates.max()),
+                "min_rate": float(rates.min()),
             },
             "interpretation": {
                 "BULLISH": "Positive funding — longs pay shorts; bullish positioning",
@@ -657,69 +889,52 @@ def get_comprehensive_market_analysis(
         # 6. Orderbook analysis
         orderbook_analysis = {}
         try:
-            orderbook = client.get_depth(symbol, limit=20)
-            bids = [[float(price), float(qty)] for price, qty in orderbook.get("bids", [])]
-            asks = [[float(price), float(qty)] for price, qty in orderbook.get("asks", [])]
+            orderbook = depth_future.result()
+            bid_px, bid_qty = _depth_to_soa(orderbook.get("bids", []))
+            ask_px, ask_qty = _depth_to_soa(orderbook.get("asks", []))
             
-            if bids and asks:
+            if bid_px.size and ask_px.size:
                 # Calculate spread
-                best_bid = bids[0][0]
-                best_ask = asks[0][0]
+                best_bid = float(bid_px[0])
+                best_ask = float(ask_px[0])
                 spread_abs = best_ask - best_bid
                 mid_price = (best_bid + best_ask) / 2
                 spread_pct = (spread_abs / mid_price) * 100
                 
-                # Detect walls
-                bid_volumes = [qty for _, qty in bids]
-                ask_volumes = [qty for _, qty in asks]
-                avg_bid_volume = np.mean(bid_volumes) if bid_volumes else 0
-                avg_ask_volume = np.mean(ask_volumes) if ask_volumes else 0
-                
-                buy_wall_threshold = avg_bid_volume * 3
-                sell_wall_threshold = avg_ask_volume * 3
+                # Detect walls among the top 5 levels
+                buy_wall_threshold = bid_qty.mean() * 3
+                sell_wall_threshold = ask_qty.mean() * 3
                 
                 buy_walls = []
-                for price, qty in bids[:5]:
-                    if qty >= buy_wall_threshold:
-                        buy_walls.append({
-                            "price": price,
-                            "quantity": qty,
-                            "distance_pct": ((mid_price - price) / mid_price) * 100
-                        })
+                for i in np.flatnonzero(bid_qty[:5] >= buy_wall_threshold):
+                    price = float(bid_px[i])
+                    buy_walls.append({
+                        "price": price,
+                        "quantity": float(bid_qty[i]),
+                        "distance_pct": ((mid_price - price) / mid_price) * 100
+                    })
                 
                 sell_walls = []
-                for price, qty in asks[:5]:
-                    if qty >= sell_wall_threshold:
-                        sell_walls.append({
-                            "price": price,
-                            "quantity": qty,
-                            "distance_pct": ((price - mid_price) / mid_price) * 100
-                        })
+                for i in np.flatnonzero(ask_qty[:5] >= sell_wall_threshold):
+                    price = float(ask_px[i])
+                    sell_walls.append({
+                        "price": price,
+                        "quantity": float(ask_qty[i]),
+                        "distance_pct": ((price - mid_price) / mid_price) * 100
+                    })
                 
                 # Calculate order imbalance
-                total_bid_volume = sum(bid_volumes)
-                total_ask_volume = sum(ask_volumes)
+                total_bid_volume = float(bid_qty.sum())
+                total_ask_volume = float(ask_qty.sum())
                 imbalance_ratio = total_bid_volume / total_ask_volume if total_ask_volume > 0 else 999
                 
-                if imbalance_ratio > 1.5:
-                    pressure = "BUY_HEAVY"
-                elif imbalance_ratio < 0.67:
-                    pressure = "SELL_HEAVY"
-                else:
-                    pressure = "BALANCED"
-                
-                # Calculate liquidity within 1%
-                def calc_liquidity_1pct(orders, mid, is_bid):
-                    total = 0
-                    for price, qty in orders:
-                        if is_bid and price >= mid * 0.99:
-                            total += price * qty
-                        elif not is_bid and price <= mid * 1.01:
-                            total += price * qty
-                    return total
+                pressure = _PRESSURE_LABELS[bisect.bisect_right(_PRESSURE_BINS, imbalance_ratio)]
                 
-                bid_liq_1pct = calc_liquidity_1pct(bids, mid_price, True)
-                ask_liq_1pct = calc_liquidity_1pct(asks, mid_price, False)
+                # Calculate liquidity (notional value) within 1% of mid
+                bid_in_range = bid_px >= mid_price * 0.99
+                ask_in_range = ask_px <= mid_price * 1.01
+                bid_liq_1pct = float(np.dot(bid_px[bid_in_range], bid_qty[bid_in_range]))
+                ask_liq_1pct = float(np.dot(ask_px[ask_in_range], ask_qty[ask_in_range]))
                 avg_liq = (bid_liq_1pct + ask_liq_1pct) / 2
                 
                 liq_assessment = "HIGH" if avg_liq > 100000 else "MEDIUM" if avg_liq > 20000 else "LOW"
@@ -728,8 +943,8 @@ def get_comprehensive_market_analysis(
                     "spread": {
                         "best_bid": best_bid,
                         "best_ask": best_ask,
-                        "best_bid_size": bids[0][1],
-                        "best_ask_size": asks[0][1],
+                        "best_bid_size": float(bid_qty[0]),
+                        "best_ask_size": float(ask_qty[0]),
                         "spread_absolute": spread_abs,
                         "spread_pct": spread_pct,
                         "mid_price": mid_price
@@ -775,11 +990,10 @@ def get_comprehensive_market_analysis(
             "funding_analysis": funding_analysis,
             "open_interest_analysis": open_interest_analysis,
             "orderbook_analysis": orderbook_analysis,
-            "recent_klines": primary_klines[-20:]  # Last 20 klines from primary timeframe
+            "recent_klines": compact_rows(primary_klines[-20:])  # Last 20 primary klines, one per line
         }
         
         # Log summary of the comprehensive analysis
-        from loguru import logger
         logger.info(f"📊 Comprehensive Market Analysis for {symbol}:")
         logger.info(f"  Primary Interval: {primary_interval}")
         logger.info(f"  Current Price: ${current_price:,.2f}")
@@ -807,7 +1021,7 @@ def get_comprehensive_market_analysis(
         logger.info(f"  Open Interest: {open_interest_analysis.get('open_interest', 0):,.2f}")
         logger.info(f"  K-lines: {len(primary_klines[-20:])} bars included")
         
-        return json.dumps(result, indent=2)
+        return dumps(result, indent=True)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return dumps({"error": str(e)})
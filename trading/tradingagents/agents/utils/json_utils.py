@@ -0,0 +1,45 @@
+"""
+JSON serialization helpers shared by the agent tools.
+
+Encodes and decodes with orjson (a declared dependency, implemented in C) and
+falls back to the stdlib json module if it is not installed.
+"""
+
+import json
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to stdlib json
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj (NumPy values included, with orjson) to a JSON string."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, ready to send as a request body."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def compact_rows(rows: List[Dict]) -> List[Any]:
+    """
+    Pre-serialize rows so an indented dumps() prints each one on a single line.
+    
+    Without orjson the rows are returned unchanged and indented as usual.
+    """
+    if orjson is None:
+        return rows
+    return [orjson.Fragment(orjson.dumps(row)) for row in rows]
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception type
+loads = orjson.loads if orjson is not None else json.loads
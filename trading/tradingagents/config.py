@@ -185,6 +185,7 @@ class LLMConfig:
     temperature and max_tokens are hardcoded in the initialization.
     """
     model: str
+    latency_optimized: bool = False  # Request the provider's low-latency tier (OpenAI service_tier="priority")
     
     @property
     def provider(self) -> str:
@@ -251,6 +252,7 @@ class AccountConfig:
             },
             "llm": {
                 "model": self.llm.model,
+                "latency_optimized": self.llm.latency_optimized,
             }
         }
 
@@ -315,6 +317,7 @@ def load_accounts_config(config_file: str = None) -> list[AccountConfig]:
             ),
             llm=LLMConfig(
                 model=llm_model,
+                latency_optimized=account_dict.get("llm_latency_optimized", False),
             )
         )
         
@@ -442,6 +445,8 @@ def set_env_from_config(config_file: str = None) -> None:
         os.environ["ANALYSIS_API_URL"] = analysis_api["url"]
     if analysis_api.get("auth"):
         os.environ["ANALYSIS_API_AUTH"] = analysis_api["auth"]
+    if analysis_api.get("batch_size"):
+        os.environ["ANALYSIS_API_BATCH_SIZE"] = str(analysis_api["batch_size"])
     
     # Set X402 payment config
     x402_config = config.get("x402", {})
@@ -5,12 +5,14 @@ Provides the main trading loop and graph construction for the AI trading system.
 Uses LangGraph's init_chat_model for unified multi-provider LLM support.
 """
 
+import asyncio
 import os
 import sqlite3
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -63,15 +65,30 @@ from tradingagents.agents.utils.agent0_tools_a2a import (
 )
 
 
-def initialize_llm(llm_config: LLMConfig) -> BaseChatModel:
+# Process-wide keep-alive HTTP client for OpenAI-compatible providers, so every
+# node and model instance reuses pooled TLS connections instead of opening new ones.
+# The async client binds its pool to an event loop, so each run creates its own
+# inside the loop that drives the graph (see run_trading_strategy).
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_SHARED_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS)
+
+
+def initialize_llm(
+    llm_config: LLMConfig,
+    http_async_client: Optional[httpx.AsyncClient] = None,
+) -> BaseChatModel:
     """
     Initialize LLM with automatic provider detection.
     
     Supports OpenAI, DeepSeek (via OpenAI API), Gemini, and Anthropic models.
     Automatically selects the correct provider based on model name.
+    Provider-level latency options (e.g. OpenAI priority tier) are applied here,
+    so agent nodes receive a fully configured model.
     
     Args:
         llm_config: LLM configuration object
+        http_async_client: Keep-alive async HTTP client for OpenAI-compatible
+            providers; must belong to the event loop that will run the model
     
     Returns:
         BaseChatModel instance (ChatOpenAI, ChatAnthropic, ChatGoogleGenerativeAI, etc.)
@@ -82,9 +99,13 @@ def initialize_llm(llm_config: LLMConfig) -> BaseChatModel:
     
     # Initialize the appropriate chat model based on provider
     if provider == "openai":
+        # Priority processing is OpenAI's latency-optimized tier (billed at a premium)
         llm = ChatOpenAI(
             model=llm_config.model,
             api_key=api_key,
+            service_tier="priority" if llm_config.latency_optimized else None,
+            http_client=_SHARED_HTTP_CLIENT,
+            http_async_client=http_async_client,
         )
     elif provider == "deepseek":
         # DeepSeek uses OpenAI-compatible API
@@ -92,6 +113,8 @@ def initialize_llm(llm_config: LLMConfig) -> BaseChatModel:
             model=llm_config.model,
             api_key=api_key,
             base_url="https://api.deepseek.com",
+            http_client=_SHARED_HTTP_CLIENT,
+            http_async_client=http_async_client,
         )
     elif provider == "gemini":
         # Google Gemini
@@ -108,11 +131,20 @@ def initialize_llm(llm_config: LLMConfig) -> BaseChatModel:
     else:
         raise ValueError(f"Unsupported provider: {provider}")
     
+    if llm_config.latency_optimized and provider != "openai":
+        logger.warning(f"⚠️ latency_optimized is not supported for {provider.upper()}, using default tier")
+    
     logger.info(f"✅ Initialized {provider.upper()} model: {llm_config.model}")
     return llm
 
 
-def create_futures_trading_graph(llm, symbol: str, trade_date: str, checkpointer=None):
+def create_futures_trading_graph(
+    llm,
+    symbol: str,
+    trade_date: str,
+    checkpointer=None,
+    short_circuit_idle_hold: bool = False,
+):
     """
     Build the futures trading graph.
 
@@ -127,6 +159,8 @@ def create_futures_trading_graph(llm, symbol: str, trade_date: str, checkpointer
         symbol: Trading symbol
         trade_date: Trading date
         checkpointer: Optional checkpointer for state persistence
+        short_circuit_idle_hold: Let the Trader finish HOLD plans on a flat
+            account without an LLM call
 
     Returns:
         Compiled LangGraph workflow
@@ -134,7 +168,7 @@ def create_futures_trading_graph(llm, symbol: str, trade_date: str, checkpointer
     # Create agent nodes
     risk_manager = create_risk_manager(llm)
     portfolio_manager = create_portfolio_manager(llm)
-    trader = create_trader(llm)
+    trader = create_trader(llm, short_circuit_idle_hold=short_circuit_idle_hold)
     
     # Build the graph
     workflow = StateGraph(AgentState)
@@ -293,9 +327,6 @@ def run_trading_strategy(symbol: str, config: Optional[AccountConfig] = None):
         rpc_url=agent0_config.get("rpc_url"),
     )
 
-    # Initialize LLM with explicit config
-    llm = initialize_llm(config.llm)
-    
     # Build the trading graph with persistent checkpoints
     state_dir = Path("state")
     state_dir.mkdir(parents=True, exist_ok=True)
@@ -308,7 +339,7 @@ def run_trading_strategy(symbol: str, config: Optional[AccountConfig] = None):
     # Checkpointer disabled - rely on stateless agent communication
     checkpointer = None
     
-    graph = create_futures_trading_graph(llm, symbol, current_date, checkpointer)
+    system_config = get_system_config()
     
     # Generate UUID for this trading round
     record_id = str(uuid.uuid4())
@@ -408,7 +439,6 @@ def run_trading_strategy(symbol: str, config: Optional[AccountConfig] = None):
     # Execute the graph (stream updates for real-time logging)
     try:
         final_state = {**initial_state}
-        last_node = None
         
         stream_config = {
             "recursion_limit": 150,  # Increased from 100 to allow complex operations
@@ -417,117 +447,138 @@ def run_trading_strategy(symbol: str, config: Optional[AccountConfig] = None):
             },
         }
         stream_kwargs = {"config": stream_config}
-        try:
-            stream_iterator = graph.stream(initial_state, stream_mode="updates", **stream_kwargs)
-        except TypeError:
-            stream_iterator = graph.stream(initial_state, **stream_kwargs)
         
-        for chunk in stream_iterator:
-            if not isinstance(chunk, dict):
-                continue
+        async def stream_graph_updates(graph):
+            """Drive the graph asynchronously so async nodes and tool calls can overlap I/O."""
+            last_node = None
+            try:
+                stream_iterator = graph.astream(initial_state, stream_mode="updates", **stream_kwargs)
+            except TypeError:
+                stream_iterator = graph.astream(initial_state, **stream_kwargs)
             
-            for node_name, node_update in chunk.items():
-                if not isinstance(node_update, dict):
+            async for chunk in stream_iterator:
+                if not isinstance(chunk, dict):
                     continue
+            
+                for node_name, node_update in chunk.items():
+                    if not isinstance(node_update, dict):
+                        continue
                 
-                # Merge incremental state for this node
-                final_state.update(node_update)
+                    # Merge incremental state for this node
+                    final_state.update(node_update)
                 
-                # Progress hint for node transitions
-                if node_name != last_node:
-                    logger.info(f"🔄 Node in progress: {node_name}")
-                    last_node = node_name
+                    # Progress hint for node transitions
+                    if node_name != last_node:
+                        logger.info(f"🔄 Node in progress: {node_name}")
+                        last_node = node_name
                 
-                # Log tool call requests from agent nodes (before they go to tool nodes)
-                if node_name in {"risk_manager", "trader"}:
-                    messages = node_update.get("messages") or []
-
-                    # Check the last message for tool calls
-                    if messages:
-                        last_message = messages[-1]
-                        tool_calls = extract_tool_calls(last_message)
-
-                        if tool_calls:
-                            # Map node name to agent name
-                            agent_name_map = {
-                                "risk_manager": "Risk Manager",
-                                "trader": "Trader"
-                            }
-                            agent_name = agent_name_map.get(node_name, node_name)
+                    # Log tool call requests from agent nodes (before they go to tool nodes)
+                    if node_name in {"risk_manager", "trader"}:
+                        messages = node_update.get("messages") or []
+
+                        # Check the last message for tool calls
+                        if messages:
+                            last_message = messages[-1]
+                            tool_calls = extract_tool_calls(last_message)
+
+                            if tool_calls:
+                                # Map node name to agent name
+                                agent_name_map = {
+                                    "risk_manager": "Risk Manager",
+                                    "trader": "Trader"
+                                }
+                                agent_name = agent_name_map.get(node_name, node_name)
                             
-                            # Log each tool call
-                            for call in tool_calls:
-                                tool_name = call.get("name", "unknown_tool")
-                                args = call.get("args", {})
+                                # Log each tool call
+                                for call in tool_calls:
+                                    tool_name = call.get("name", "unknown_tool")
+                                    args = call.get("args", {})
                                 
-                                # Format arguments for display (show all args completely, no truncation)
-                                args_str = ", ".join(
-                                    f"{k}={v}" for k, v in args.items()
-                                )
+                                    # Format arguments for display (show all args completely, no truncation)
+                                    args_str = ", ".join(
+                                        f"{k}={v}" for k, v in args.items()
+                                    )
                                 
-                                logger.info(f"🔧 [{agent_name}] Calling tool: {tool_name}({args_str})")
+                                    logger.info(f"🔧 [{agent_name}] Calling tool: {tool_name}({args_str})")
                 
-                # Log tool execution errors from tool nodes
-                if node_name in {"risk_manager_tools", "trader_tools"}:
-                    messages = node_update.get("messages") or []
-
-                    for message in messages:
-                            response_text = extract_content_text(message)
-                            if response_text:
-                                # Check for actual errors (not just JSON keys containing "error")
-                                # Parse as JSON first to detect real errors
-                                import json
-                                is_error = False
-                                try:
-                                    data = json.loads(response_text)
-                                    # Check if it's an error response (has "error" key with non-empty value)
-                                    if isinstance(data, dict) and "error" in data and data["error"]:
-                                        is_error = True
-                                except (json.JSONDecodeError, TypeError):
-                                    # Not JSON, check for text-based error indicators
-                                    if "not a valid tool" in response_text.lower():
-                                        is_error = True
-
-                                if is_error:
-                                    logger.error(f"⚠️  Tool error: {response_text}")
-
-                    # Don't print other info for tool nodes, just continue
-                    continue
+                    # Log tool execution errors from tool nodes
+                    if node_name in {"risk_manager_tools", "trader_tools"}:
+                        messages = node_update.get("messages") or []
+
+                        for message in messages:
+                                response_text = extract_content_text(message)
+                                if response_text:
+                                    # Check for actual errors (not just JSON keys containing "error")
+                                    # Parse as JSON first to detect real errors
+                                    import json
+                                    is_error = False
+                                    try:
+                                        data = json.loads(response_text)
+                                        # Check if it's an error response (has "error" key with non-empty value)
+                                        if isinstance(data, dict) and "error" in data and data["error"]:
+                                            is_error = True
+                                    except (json.JSONDecodeError, TypeError):
+                                        # Not JSON, check for text-based error indicators
+                                        if "not a valid tool" in response_text.lower():
+                                            is_error = True
+
+                                    if is_error:
+                                        logger.error(f"⚠️  Tool error: {response_text}")
+
+                        # Don't print other info for tool nodes, just continue
+                        continue
 
-                # Log text report outputs from each node
-                # Note: Research reports are now included in Risk Manager's tool responses
+                    # Log text report outputs from each node
+                    # Note: Research reports are now included in Risk Manager's tool responses
                 
-                if node_update.get("risk_assessment"):
-                    logger.info("\n" + "="*80)
-                    logger.info("🛡️ Risk Manager – Assessment Completed")
-                    logger.info("="*80)
-                    logger.info(node_update["risk_assessment"])
+                    if node_update.get("risk_assessment"):
+                        logger.info("\n" + "="*80)
+                        logger.info("🛡️ Risk Manager – Assessment Completed")
+                        logger.info("="*80)
+                        logger.info(node_update["risk_assessment"])
                     
-                    # Log human-friendly summary if available
-                    if node_update.get("risk_assessment_summary"):
-                        logger.info("\n" + "-"*80)
-                        logger.info("💭 Plain Language Summary:")
-                        logger.info("-"*80)
-                        logger.info(node_update["risk_assessment_summary"])
+                        # Log human-friendly summary if available
+                        if node_update.get("risk_assessment_summary"):
+                            logger.info("\n" + "-"*80)
+                            logger.info("💭 Plain Language Summary:")
+                            logger.info("-"*80)
+                            logger.info(node_update["risk_assessment_summary"])
                 
-                if node_update.get("portfolio_plan"):
-                    logger.info("\n" + "="*80)
-                    logger.info("💼 Portfolio Manager – Plan Completed")
-                    logger.info("="*80)
-                    logger.info(node_update["portfolio_plan"])
+                    if node_update.get("portfolio_plan"):
+                        logger.info("\n" + "="*80)
+                        logger.info("💼 Portfolio Manager – Plan Completed")
+                        logger.info("="*80)
+                        logger.info(node_update["portfolio_plan"])
                     
-                    # Log human-friendly summary if available
-                    if node_update.get("portfolio_plan_summary"):
-                        logger.info("\n" + "-"*80)
-                        logger.info("💭 Plain Language Summary:")
-                        logger.info("-"*80)
-                        logger.info(node_update["portfolio_plan_summary"])
+                        # Log human-friendly summary if available
+                        if node_update.get("portfolio_plan_summary"):
+                            logger.info("\n" + "-"*80)
+                            logger.info("💭 Plain Language Summary:")
+                            logger.info("-"*80)
+                            logger.info(node_update["portfolio_plan_summary"])
                 
-                if node_update.get("trade_report_summary"):
-                    logger.info("\n" + "="*80)
-                    logger.info("✅ Trader – Trade Execution Summary")
-                    logger.info("="*80)
-                    logger.info(node_update["trade_report_summary"])
+                    if node_update.get("trade_report_summary"):
+                        logger.info("\n" + "="*80)
+                        logger.info("✅ Trader – Trade Execution Summary")
+                        logger.info("="*80)
+                        logger.info(node_update["trade_report_summary"])
+        
+        async def run_graph():
+            """Build the LLM and graph inside this event loop and drive them to completion."""
+            # The async HTTP client lives exactly as long as the loop it is bound to
+            async with httpx.AsyncClient(limits=_HTTP_LIMITS) as http_async_client:
+                # Initialize LLM with explicit config
+                llm = initialize_llm(config.llm, http_async_client=http_async_client)
+                graph = create_futures_trading_graph(
+                    llm,
+                    symbol,
+                    current_date,
+                    checkpointer,
+                    short_circuit_idle_hold=system_config.get("trader_short_circuit_idle_hold", False),
+                )
+                await stream_graph_updates(graph)
+        
+        asyncio.run(run_graph())
         
         logger.info("\n" + "="*80)
         logger.info("✨ Strategy execution completed")